@@ -0,0 +1,264 @@
+#Runs new_script.py in several headless Blender instances at once, and tunes how many instances, CPU threads,
+#tile size and persistent data work best on this machine.
+#
+#   python batch_runner.py autotune --blender /path/to/blender --input /path/to/mainmeshfolder
+#   python batch_runner.py run --blender /path/to/blender
+#
+#'autotune' saves the best settings to profiles/<hostname>.json and 'run' loads that profile automatically.
+#This script does not need Blender's Python: it only starts Blender processes.
+
+# Import necessary modules
+import argparse  # Standard Python module for parsing command line options
+import json  # Standard Python module for reading and writing profiles and timing reports
+import os  # Standard Python module for interacting with the operating system
+import shutil  # Standard Python module for removing calibration output
+import socket  # Standard Python module used to name the profile after this machine
+import subprocess  # Standard Python module for starting Blender processes
+import sys  # Standard Python module used to return the exit code
+import tempfile  # Standard Python module for the calibration output folder
+import time  # Standard Python module for timing the batch
+
+# Folder of this script, next to new_script.py and the modelviewer package
+script_folder = os.path.dirname(os.path.abspath(__file__))
+render_script_path = os.path.join(script_folder, "new_script.py")
+sys.path.insert(0, script_folder)
+from modelviewer.jobs import list_mesh_files  # Plain Python, does not need Blender
+
+# Settings used when no profile exists for this machine
+default_settings = {"workers": 1, "threads": 0, "tile_size": 0, "persistent_data": False}
+
+# Function to return the profile file of this machine
+def default_profile_path():
+    return os.path.join(script_folder, "profiles", f"{socket.gethostname()}.json")
+
+# Function to load a profile, returning None if it does not exist
+def load_profile(profile_path):
+    if not os.path.exists(profile_path):
+        return None
+    with open(profile_path) as profile_file:
+        return json.load(profile_file)
+
+# Function to build the command line of one Blender worker
+def worker_command(blender_path, settings, worker_index, worker_count, extra_arguments):
+    # --python-exit-code makes Blender exit with 1 when the script raises, instead of 0
+    command = [blender_path, "-b", "--python-exit-code", "1", "-P", render_script_path, "--", "worker",
+               "--worker-index", str(worker_index), "--worker-count", str(worker_count),
+               "--threads", str(settings["threads"]), "--tile-size", str(settings["tile_size"])]
+    if settings["persistent_data"]:
+        command.append("--persistent-data")
+    return command + extra_arguments
+
+# Function to start one Blender process per command, wait for all of them and return their exit codes and
+# wall-clock seconds (including Blender's own startup, which the workers cannot time themselves)
+def run_workers(commands, log_folder=None):
+    processes = []
+    for index, command in enumerate(commands):
+        log_file = open(os.path.join(log_folder, f"worker{index}.log"), 'w') if log_folder else None
+        processes.append((subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT if log_file else None),
+                          log_file, time.perf_counter()))
+    exit_codes = [None] * len(processes)
+    wall_seconds = [None] * len(processes)
+    while None in exit_codes:
+        for index, (process, log_file, start_time) in enumerate(processes):
+            if exit_codes[index] is None and process.poll() is not None:
+                exit_codes[index] = process.returncode
+                wall_seconds[index] = time.perf_counter() - start_time
+                if log_file:
+                    log_file.close()
+        time.sleep(0.1)
+    return exit_codes, wall_seconds
+
+# Function to render the whole batch with the settings from the machine's profile
+def run_batch(arguments):
+    profile = load_profile(arguments.profile)
+    settings = dict(profile["best"]) if profile else dict(default_settings)
+    print(f"Using {'profile ' + arguments.profile if profile else 'default settings'}: {settings}")
+    if arguments.workers:
+        settings["workers"] = arguments.workers  # Explicit override of the profile
+    extra_arguments = []
+    if arguments.input:
+        extra_arguments += ["--input", arguments.input]
+    if arguments.output:
+        extra_arguments += ["--output", arguments.output]
+    start_time = time.perf_counter()
+    commands = [worker_command(arguments.blender, settings, index, settings["workers"], extra_arguments)
+                for index in range(settings["workers"])]
+    exit_codes, _ = run_workers(commands)
+    print(f"Batch finished in {time.perf_counter() - start_time:.1f} s, worker exit codes: {exit_codes}")
+    return 1 if any(exit_codes) else 0
+
+# Function to pick meshes spread across the batch by file size, so calibration sees small and large meshes
+def pick_calibration_meshes(main_folder_path, count):
+    mesh_files = sorted((os.path.getsize(os.path.join(main_folder_path, mesh_name)), mesh_name)
+                        for mesh_name in list_mesh_files(main_folder_path))
+    if len(mesh_files) <= count:
+        return [name for _, name in mesh_files]
+    # Take the middle mesh of each of 'count' equally sized groups
+    return [mesh_files[round((i + 0.5) * len(mesh_files) / count - 0.5)][1] for i in range(count)]
+
+# Function to run one calibration trial and return the measured meshes per hour, or None if a worker failed,
+# together with the meshes per hour of the workload's renders alone (without worker startup and per-mesh setup).
+# Every worker renders all calibration meshes at the same time, so the trial includes the contention between workers.
+def measure_throughput(arguments, settings, workload, mesh_list_path, trial_folder):
+    commands = []
+    report_paths = []
+    for index in range(settings["workers"]):
+        worker_folder = os.path.join(trial_folder, f"worker{index}")
+        os.makedirs(worker_folder, exist_ok=True)
+        report_paths.append(os.path.join(worker_folder, "report.json"))
+        commands.append(worker_command(arguments.blender, settings, 0, 1, [
+            "--input", arguments.input, "--output", worker_folder, "--mesh-list", mesh_list_path,
+            "--workload", workload, "--turntable-frames", str(arguments.calibration_frames), "--report", report_paths[-1]]))
+    exit_codes, wall_seconds = run_workers(commands, trial_folder)
+    if any(exit_codes):
+        print(f"  {workload}: a worker failed (exit codes {exit_codes}), see logs in {trial_folder}")
+        return None, None
+    worker_seconds = []
+    worker_render_seconds = []
+    meshes_rendered = 0
+    for report_path, process_seconds in zip(report_paths, wall_seconds):
+        try:
+            with open(report_path) as report_file:
+                report = json.load(report_file)
+        except (OSError, ValueError):
+            print(f"  {workload}: a worker wrote no readable report ({report_path}), see logs in {trial_folder}")
+            return None, None
+        # The process wall clock covers Blender's start, module imports, scene setup, per-mesh setup and shutdown
+        overhead_seconds = process_seconds
+        render_seconds = 0
+        for mesh in report["meshes"]:
+            # Scale the shortened turntables back to their full length
+            turntable_scale = report["full_turntable_frames"] / mesh["turntable_frames"]
+            overhead_seconds -= mesh["stills_seconds"] + mesh["turntable_seconds"]
+            render_seconds += mesh["stills_seconds"] + mesh["turntable_seconds"] * turntable_scale
+        worker_seconds.append(max(0, overhead_seconds) + render_seconds)
+        worker_render_seconds.append(render_seconds)
+        meshes_rendered += len(report["meshes"])
+    if not meshes_rendered or not max(worker_render_seconds):
+        return None, None
+    return meshes_rendered / max(worker_seconds) * 3600, meshes_rendered / max(worker_render_seconds) * 3600
+
+# Function to tune workers, threads per worker, tile size and persistent data and save the best settings
+def autotune(arguments):
+    core_count = os.cpu_count() or 1
+    worker_options = [workers for workers in (1, 2, 4, 8, 16) if workers <= min(core_count, arguments.max_workers)]
+    calibration_meshes = pick_calibration_meshes(arguments.input, arguments.meshes)
+    if not calibration_meshes:
+        print(f"No meshes found in {arguments.input}")
+        return 1
+    print(f"Calibrating on {core_count} cores with {calibration_meshes}")
+    work_folder = tempfile.mkdtemp(prefix="autotune_")
+    mesh_list_path = os.path.join(work_folder, "meshes.txt")
+    with open(mesh_list_path, 'w') as mesh_list_file:
+        mesh_list_file.write("\n".join(calibration_meshes) + "\n")
+
+    trials = []
+    failed_trials = False
+    rates = {}  # Settings already measured -> meshes per hour (0 when the trial failed)
+
+    # Function to run the stills and turntable workloads with settings once and return the combined meshes per hour
+    def run_trial(settings):
+        nonlocal failed_trials
+        key = tuple(sorted(settings.items()))
+        if key in rates:
+            return rates[key]
+        print(f"Trial {len(trials) + 1}: {settings}")
+        trial = dict(settings)
+        render_only = {}
+        for workload in ("stills", "turntable"):
+            trial_folder = os.path.join(work_folder, f"trial{len(trials) + 1}_{workload}")
+            trial[f"{workload}_meshes_per_hour"], render_only[workload] = measure_throughput(
+                arguments, settings, workload, mesh_list_path, trial_folder)
+            if trial[f"{workload}_meshes_per_hour"] is not None:
+                print(f"  {workload}: {trial[f'{workload}_meshes_per_hour']:.1f} meshes/hour")
+                shutil.rmtree(trial_folder, ignore_errors=True)
+            else:
+                failed_trials = True  # Keep the worker logs of the failed trial
+        if trial["stills_meshes_per_hour"] and trial["turntable_meshes_per_hour"]:
+            # A full job renders both, so the hours per mesh of the two workloads add up. Startup and per-mesh
+            # setup are paid once per job, so they are taken from the stills trial only.
+            trial["meshes_per_hour"] = 1 / (1 / trial["stills_meshes_per_hour"] + 1 / render_only["turntable"])
+        else:
+            trial["meshes_per_hour"] = None
+        trials.append(trial)
+        rates[key] = trial["meshes_per_hour"] or 0
+        return rates[key]
+
+    # Rather than every combination, tune one setting at a time for each worker count (threads, then tile size,
+    # then persistent data), keeping the best value found so far. Larger worker counts are not tried once adding
+    # workers stops improving the throughput.
+    previous_rate = 0
+    for workers in worker_options:
+        # Either share all cores between the workers or leave half of them for other work (e.g. video encoding)
+        thread_options = sorted(set(max(1, core_count // (workers * divisor)) for divisor in (1, 2)), reverse=True)
+        best_settings = {"workers": workers, "threads": thread_options[0],
+                         "tile_size": arguments.tile_sizes[len(arguments.tile_sizes) // 2], "persistent_data": False}
+        best_rate = 0
+        for name, values in (("threads", thread_options), ("tile_size", arguments.tile_sizes), ("persistent_data", (False, True))):
+            for value in values:
+                settings = dict(best_settings, **{name: value})
+                rate = run_trial(settings)
+                if rate > best_rate:
+                    best_settings, best_rate = settings, rate
+        if best_rate <= previous_rate:
+            print(f"{workers} workers are no faster than fewer, not trying more")
+            break
+        previous_rate = best_rate
+    if failed_trials:
+        print(f"Logs of the failed trials are kept in {work_folder}")
+    else:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+    measured = [trial for trial in trials if trial["meshes_per_hour"]]
+    if not measured:
+        print("Every calibration trial failed, no profile written")
+        return 1
+    setting_keys = ("workers", "threads", "tile_size", "persistent_data")
+
+    def best_for(key):
+        best_trial = max((trial for trial in trials if trial[key]), key=lambda trial: trial[key])
+        return dict({name: best_trial[name] for name in setting_keys}, meshes_per_hour=best_trial[key])
+
+    profile = {
+        "host": socket.gethostname(),
+        "cpu_count": core_count,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "calibration_meshes": calibration_meshes,
+        "calibration_frames": arguments.calibration_frames,
+        "best": best_for("meshes_per_hour"),
+        "best_stills": best_for("stills_meshes_per_hour"),
+        "best_turntable": best_for("turntable_meshes_per_hour"),
+        "trials": trials,
+    }
+    os.makedirs(os.path.dirname(arguments.profile), exist_ok=True)
+    with open(arguments.profile, 'w') as profile_file:
+        json.dump(profile, profile_file, indent=2)
+    print(f"Best settings {profile['best']} saved to {arguments.profile}")
+    return 0
+
+# Command line interface
+def main():
+    parser = argparse.ArgumentParser(description="Run new_script.py in parallel Blender instances and tune them per machine.")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--profile", default=default_profile_path(), help="settings profile of this machine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="render the batch with the profile's settings")
+    run_parser.add_argument("--input", help="main folder containing the mesh subfolders (defaults to new_script.py's)")
+    run_parser.add_argument("--output", help="folder the renders are written to (defaults to new_script.py's)")
+    run_parser.add_argument("--workers", type=int, default=0, help="override the number of Blender instances")
+
+    autotune_parser = commands.add_parser("autotune", help="measure throughput and save the best settings")
+    autotune_parser.add_argument("--input", required=True, help="main folder containing the mesh subfolders")
+    autotune_parser.add_argument("--meshes", type=int, default=3, help="number of representative meshes to calibrate on")
+    autotune_parser.add_argument("--calibration-frames", type=int, default=6, help="turntable length used while calibrating")
+    autotune_parser.add_argument("--max-workers", type=int, default=8, help="largest number of Blender instances tried")
+    autotune_parser.add_argument("--tile-sizes", type=int, nargs="+", default=[64, 256, 2048], help="Cycles tile sizes tried")
+
+    arguments = parser.parse_args()
+    if arguments.command == "autotune":
+        return autotune(arguments)
+    return run_batch(arguments)
+
+if __name__ == "__main__":
+    sys.exit(main())
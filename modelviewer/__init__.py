@@ -0,0 +1,7 @@
+#Blender 3D model viewer pipeline: renders still images and stereoscopic turntables of batches of meshes.
+#
+#The package is split so that workers only pay for what they use:
+#  config, geometry, jobs, imaging, writer  - plain Python/NumPy, importable without Blender (bpy)
+#  scene, meshes, textures, rendering, temporal, turntable, stereo, pipeline  - need Blender's bpy
+#  cli  - entry points for batch, single-mesh and worker runs (see new_script.py)
+#Nothing is imported here, so 'from modelviewer.geometry import generate_camera_positions' has no side effects.
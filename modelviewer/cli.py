@@ -0,0 +1,114 @@
+#Command line entry points of the pipeline, given after '--' when Blender runs new_script.py headless, e.g.
+#   blender -b -P new_script.py -- batch --input /path/to/mainmeshfolder
+#   blender -b -P new_script.py -- single /path/to/mainmeshfolder/subfolder/mesh.obj
+#   blender -b -P new_script.py -- worker --worker-index 0 --worker-count 4 --threads 8
+#Without a subcommand (e.g. when running from Blender's text editor) the whole batch is rendered with the config defaults.
+#Blender modules are only imported once the options are parsed, and the scene is only built when there is a mesh to render.
+
+# Import necessary modules
+import argparse  # Standard Python module for parsing the command line options
+import json  # Standard Python module used to write the timing report
+import os  # Standard Python module for interacting with the operating system
+import time  # Standard Python module used to measure startup and per-job overhead
+from . import config
+from .jobs import assign_meshes, list_mesh_files, read_mesh_list
+
+# Subcommands; 'batch' is used when none is given
+commands = ("batch", "single", "worker")
+
+# Function to build the command line parser
+def build_parser():
+    # Options shared by every subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--input", default=config.main_folder_path, help="main folder containing the mesh subfolders")
+    common.add_argument("--output", default=config.output_path, help="folder the renders are written to")
+    common.add_argument("--threads", type=int, default=0, help="Cycles CPU threads (0 detects the core count)")
+    common.add_argument("--tile-size", type=int, default=0, help="Cycles tile size in pixels (0 keeps Blender's default)")
+    common.add_argument("--persistent-data", action="store_true", help="keep render data in memory between renders")
+    common.add_argument("--workload", choices=["all", "stills", "turntable"], default="all", help="which renders to produce")
+    common.add_argument("--turntable-frames", type=int, default=0, help="render shorter turntables (used for calibration)")
+    common.add_argument("--report", help="JSON file to write startup and per-mesh timings to")
+
+    parser = argparse.ArgumentParser(prog="new_script.py", description="Render still images and stereoscopic turntables of meshes.")
+    subcommands = parser.add_subparsers(dest="command")
+    subcommands.add_parser("batch", parents=[common], help="render every mesh in the input folder")
+    single_parser = subcommands.add_parser("single", parents=[common], help="render one mesh file")
+    single_parser.add_argument("mesh_path", help="mesh file inside a subfolder of the input folder, or anywhere else")
+    worker_parser = subcommands.add_parser("worker", parents=[common], help="render this worker's share of the batch (used by batch_runner.py)")
+    worker_parser.add_argument("--worker-index", type=int, default=0, help="index of this worker among --worker-count workers")
+    worker_parser.add_argument("--worker-count", type=int, default=1, help="number of workers sharing the batch")
+    worker_parser.add_argument("--mesh-list", help="text file of 'subfolder/mesh_file' lines to process instead of the whole folder")
+    return parser
+
+# Function to apply the command line options to the config module
+def apply_options(arguments):
+    config.main_folder_path = arguments.input
+    config.set_output_path(arguments.output)
+    # CPU threads, tile size and persistent data (chosen per machine by 'batch_runner.py autotune')
+    if arguments.threads:
+        config.render_threads = arguments.threads
+    if arguments.tile_size:
+        config.tile_size = arguments.tile_size
+    if arguments.persistent_data:
+        config.use_persistent_data = True
+    # Shorter turntables are only used to calibrate the batch runner; timings are scaled back to full length
+    if arguments.turntable_frames:
+        config.total_frames = arguments.turntable_frames
+
+# Function to list the (main_folder_path, 'subfolder/mesh_file') jobs selected by the options
+def select_jobs(arguments):
+    if arguments.command == "single":
+        mesh_path = os.path.abspath(arguments.mesh_path)
+        subfolder_path, mesh_file = os.path.split(mesh_path)
+        return os.path.dirname(subfolder_path), [f"{os.path.basename(subfolder_path)}/{mesh_file}"]
+    if arguments.command == "worker" and arguments.mesh_list:
+        return arguments.input, read_mesh_list(arguments.mesh_list)
+    mesh_files = list_mesh_files(arguments.input)
+    if arguments.command == "worker":
+        mesh_files = assign_meshes(mesh_files, arguments.worker_index, arguments.worker_count)
+    return arguments.input, mesh_files
+
+# Function to run the pipeline; started is the time.perf_counter() value when the launcher started
+def main(argv=None, started=None):
+    entered = time.perf_counter()
+    argv = list(argv or [])
+    if not argv or argv[0] not in commands + ("-h", "--help"):
+        argv = ["batch"] + argv
+    arguments = build_parser().parse_args(argv)
+    apply_options(arguments)
+    main_folder_path, mesh_names = select_jobs(arguments)
+
+    # Blender modules are only imported here, so '--help' and option errors return right away
+    import_start_time = time.perf_counter()
+    from . import scene
+    from .pipeline import process_meshes
+    import_end_time = time.perf_counter()
+    if mesh_names:
+        scene.ensure_scene()
+    scene_end_time = time.perf_counter()
+
+    mesh_timings = process_meshes(main_folder_path, mesh_names, arguments.workload)
+    scene.shutdown()
+
+    # Startup time before the first mesh, and the mean per-job overhead (import, fitting, textures) of each mesh.
+    # Blender's own start (before this script runs) is not included; batch_runner.py times whole worker processes.
+    startup = {
+        "launcher_seconds": entered - started if started is not None else None,
+        "module_import_seconds": import_end_time - import_start_time,
+        "scene_setup_seconds": scene_end_time - import_end_time,
+        "startup_seconds": scene_end_time - (started if started is not None else entered),
+        "mean_job_overhead_seconds": sum(mesh["setup_seconds"] for mesh in mesh_timings) / len(mesh_timings) if mesh_timings else None,
+    }
+    print(f"Startup: {startup['startup_seconds']:.2f} s (modules {startup['module_import_seconds']:.2f} s, "
+          f"scene {startup['scene_setup_seconds']:.2f} s)")
+    if mesh_timings:
+        print(f"Per-job overhead: {startup['mean_job_overhead_seconds']:.2f} s mean over {len(mesh_timings)} meshes")
+
+    # Write the timing report read by batch_runner.py
+    if arguments.report:
+        with open(arguments.report, 'w') as report_file:
+            json.dump({"full_turntable_frames": config.full_turntable_frames, "startup": startup, "meshes": mesh_timings},
+                      report_file, indent=2)
+
+    print("Rendering completed.")
+    return 0
@@ -0,0 +1,84 @@
+#Settings of the render pipeline. Change them here, or from the command line options in cli.py.
+#This module does not import bpy; the scene is only configured when scene.ensure_scene() runs.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+
+# Define the main folder path where subfolders containing 3D mesh files (.obj, .stl, .glb) are located
+main_folder_path = "C:/Users/winni/Downloads/mainmeshfolder"
+
+# Define the output path where processed files and renders will be saved
+output_path = "C:/Users/winni/Downloads/mainmeshfolder/testing77"
+
+# Path to the HDRI (High Dynamic Range Image) file used for environment lighting
+hdri_path = "C:/Users/winni/Downloads/mainmeshfolder/overcast_soil_puresky_4k.exr"
+
+# Set the frame rate and calculate the total number of frames for the animation
+frame_rate = 6  # Set the frame rate to 6 frames per second
+animation_duration = 10  # Set the animation duration to 10 seconds
+total_frames = frame_rate * animation_duration  # Calculate the total number of frames
+full_turntable_frames = total_frames  # Turntable length the timings are scaled to when calibrating with shorter turntables
+
+# Set the resolution of the output images/videos
+resolution_x = 1280  # Set the horizontal resolution
+resolution_y = 720  # Set the vertical resolution
+
+# Cycles render settings
+samples = 128  # Set the number of samples for rendering (higher is better quality)
+render_threads = 0  # CPU threads (0 lets Blender detect the core count)
+tile_size = 0  # Tile size in pixels (0 keeps Blender's default)
+use_persistent_data = False  # Keep render data in memory between renders
+
+# Mesh and view settings
+target_size = (5, 5, 5)  # Bounding box every mesh is scaled to fit
+num_positions = 3  # Number of still views rendered around each mesh
+interocular_distances = [55, 60, 65]  # Interocular distances (IODs) of the stereoscopic turntables, in millimetres
+
+# Still image output settings (used when the asynchronous writer pool is enabled)
+use_async_still_writer = True  # Encode and write stills in background threads so the next view starts rendering right away
+still_png_compression = 15  # PNG compression in percent (0-100), same scale as Blender's PNG setting
+still_color_depth = 8  # Bit depth of the written PNGs (8 or 16)
+still_derivative_formats = []  # Extra copies written next to each PNG, e.g. ['WEBP', 'JPEG'] (needs Pillow)
+still_derivative_quality = 90  # Quality of the WebP/JPEG derivatives
+make_contact_sheet = False  # Assemble all still views of a mesh into a single contact sheet
+contact_sheet_thumb_width = 320  # Width of each view on the contact sheet
+still_writer_threads = 4  # Number of encoder threads
+still_writer_max_pending = 8  # Back-pressure: rendering waits when this many images are queued (about 15 MB each at 1280x720)
+
+# Texture settings
+use_texture_cache = True  # Downscale imported textures to the size they are seen at and share identical ones
+texture_detail_factor = 1.0  # Texels per screen pixel covered by the mesh (raise for sharper textures)
+texture_cache_path = os.path.join(output_path, "_texture_cache")  # Downscaled textures, shared by all workers
+texture_cache_max_megabytes = 1024  # Memory budget of the shared texture datablocks kept between meshes, per worker
+
+# Stereo view synthesis settings
+use_stereo_synthesis = False  # Synthesise left/right eyes from one centre-eye turntable instead of path-tracing every eye
+stereo_keyframe_interval = 10  # Render true left/right frames at the widest IOD every N frames to fill disocclusions
+stereo_synthesis_validation = False  # Render true eyes for every frame and IOD to report quality for all frames (slow)
+capture_path = os.path.join(output_path, "_passes", str(os.getpid()))  # Temporary folder for depth/normal passes, one per worker process
+
+# Temporal accumulation settings for turntables
+use_temporal_accumulation = False  # Render turntables at reduced samples and average neighbouring frames
+temporal_sample_fraction = 0.25  # Starting fraction of the full sample count tried during calibration
+temporal_radius = 2  # Number of neighbouring frames on each side reprojected into every frame
+temporal_depth_tolerance = 0.02  # Relative depth difference above which a reprojected pixel counts as disoccluded
+temporal_error_bound = 0.01  # Maximum RMSE (display RGB values 0-1, mesh pixels only) against a full-sample reference render
+
+# Function to change the output folder together with the working folders kept inside it
+def set_output_path(path):
+    global output_path, texture_cache_path, capture_path
+    output_path = path
+    texture_cache_path = os.path.join(path, "_texture_cache")
+    capture_path = os.path.join(path, "_passes", str(os.getpid()))
+
+# Function to tell whether rendered pixels are read back into Python (needs the compositor capture and writer pool)
+def uses_frame_capture():
+    return use_async_still_writer or use_stereo_synthesis or use_temporal_accumulation
+
+# Function to list the render passes that have to be captured besides the image
+def capture_passes():
+    if use_stereo_synthesis:
+        return ['Depth', 'Normal']
+    if use_temporal_accumulation:
+        return ['Depth']
+    return []
@@ -0,0 +1,53 @@
+#Camera and mesh geometry helpers. Plain Python (no bpy or NumPy), so they can be unit-tested and benchmarked
+#outside Blender. Positions are returned as (x, y, z) tuples, which Blender accepts wherever it expects a vector.
+
+# Import necessary modules
+import math  # Standard Python module for mathematical operations
+
+# Function to generate flexible camera positions around the object
+def generate_camera_positions(n, distance):
+    positions = {}
+    for i in range(n):  # Iterate to generate 'n' positions
+        angle = 2 * math.pi * i / n  # Calculate the angle for this position
+        x = distance * math.cos(angle)  # Calculate the X position of the camera
+        y = distance * math.sin(angle)  # Calculate the Y position of the camera
+        positions[f'angle_{i}'] = (x, y, 0)  # Store the position
+    return positions  # Return the dictionary of camera positions
+
+# Function to calculate the camera location for every frame of a turntable around center
+def turntable_camera_positions(center, frame_count, radius, eye_offset=0):
+    positions = []
+    for frame in range(1, frame_count + 1):  # Iterate through each frame
+        angle = 2 * math.pi * (frame / frame_count)  # Calculate the rotation angle for this frame
+        x = center[0] + radius * math.cos(angle) + eye_offset  # Calculate the camera's X position
+        y = center[1] + radius * math.sin(angle)  # Calculate the camera's Y position
+        positions.append((x, y, center[2]))  # Keep the camera at the centre's Z position
+    return positions
+
+# Function to calculate the size of the axis-aligned box around a list of (x, y, z) points
+def bounding_box_size(corners):
+    return tuple(max(coord) - min(coord) for coord in zip(*corners))
+
+# Function to calculate the uniform scale that fits a box of bbox_size into target_size, with padding
+def fit_scale_factor(bbox_size, target_size, padding=0.85):
+    return min(target_size[i] / bbox_size[i] for i in range(3)) * padding  # Scale down to 85% by default
+
+# Function to calculate the camera distance for a mesh whose largest dimension is max_dim
+def camera_distance_for_size(max_dim, base_distance=10, padding_factor=1.5):
+    return base_distance + max_dim * padding_factor  # Add padding based on the bounding box size
+
+# Function to calculate the focal length in pixels of a perspective camera for a given image size
+def focal_length_in_pixels(lens, sensor_width, sensor_height, sensor_fit, width, height):
+    if sensor_fit == 'VERTICAL' or (sensor_fit == 'AUTO' and height > width):
+        return lens / (sensor_height if sensor_fit == 'VERTICAL' else sensor_width) * height
+    return lens / sensor_width * width
+
+# Function to calculate the largest size in pixels a box of bbox_size can cover on screen when viewed from distance
+def projected_size_in_pixels(bbox_size, distance, focal_length):
+    radius = math.sqrt(sum(size * size for size in bbox_size)) / 2  # Radius of the bounding sphere
+    nearest = max(distance - radius, radius)  # Closest the surface can get to the camera
+    return 2 * radius * focal_length / nearest
+
+# Function to pick a power-of-two texture size that gives detail_factor texels per covered screen pixel
+def texture_target_size(coverage_pixels, detail_factor=1.0, minimum_size=64):
+    return max(minimum_size, 2 ** math.ceil(math.log2(max(1.0, coverage_pixels * detail_factor))))
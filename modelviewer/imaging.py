@@ -0,0 +1,169 @@
+#Pixel buffer helpers: colour conversion, PNG encoding, contact sheets, depth-based reprojection and image metrics.
+#Uses only NumPy (no bpy), so the functions run in writer threads and can be tested outside Blender.
+#Images are (height, width, channels) float arrays with rows ordered top to bottom.
+
+# Import necessary modules
+import math  # Standard Python module for mathematical operations
+import struct  # Standard Python module for packing binary data (used for PNG chunks)
+import zlib  # Standard Python module for compression (used by the PNG encoder)
+import numpy as np  # NumPy ships with Blender and is used to handle rendered pixel buffers
+
+# View transforms apply_view_transform reproduces exactly; others (Filmic, AgX, looks) need Blender's colour management
+supported_view_transforms = ('Raw', 'Standard')
+
+# Function to apply the scene's view transform, exposure and gamma to linear pixels, giving display values in 0-1
+def apply_view_transform(pixels, view_transform, exposure, gamma):
+    if view_transform not in supported_view_transforms:
+        raise ValueError(f"View transform '{view_transform}' cannot be applied outside Blender's colour management")
+    rgb = pixels[..., :3] * (2.0 ** exposure)  # Exposure is measured in stops
+    if view_transform == 'Standard':
+        # The sRGB display curve
+        rgb = np.clip(rgb, 0.0, None)
+        rgb = np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1 / 2.4) - 0.055)
+    rgb = np.power(np.clip(rgb, 0.0, None), 1.0 / gamma)  # Gamma as applied by Blender's colour management
+    return np.clip(np.concatenate([rgb, pixels[..., 3:4]], axis=-1), 0.0, 1.0)
+
+# Function to encode an RGB/RGBA pixel array (values 0-1) as PNG bytes without touching bpy, so it can run in a thread
+def encode_png(pixels, bit_depth=8, compression=15):
+    height, width, channels = pixels.shape
+    color_type = {3: 2, 4: 6}[channels]  # PNG colour types: 2 = RGB, 6 = RGBA
+    if bit_depth == 16:
+        data = np.round(pixels * 65535).astype('>u2')  # PNG stores 16-bit samples big-endian
+    else:
+        data = np.round(pixels * 255).astype(np.uint8)
+    rows = np.ascontiguousarray(data.reshape(height, -1)).view(np.uint8)
+    filtered = rows.copy()
+    filtered[1:] -= rows[:-1]  # 'Up' filter: store each row as the difference to the row above
+    filtered = np.concatenate([np.full((height, 1), 2, dtype=np.uint8), filtered], axis=1)
+    filtered[0, 0] = 0  # The first row has nothing above it, so it is stored unfiltered
+    level = round(compression * 9 / 100)  # Map Blender's 0-100% compression onto zlib's 0-9 levels
+
+    def chunk(chunk_type, chunk_data):
+        return struct.pack('>I', len(chunk_data)) + chunk_type + chunk_data + struct.pack('>I', zlib.crc32(chunk_type + chunk_data))
+
+    header = struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(filtered.tobytes(), level)) + chunk(b'IEND', b''))
+
+# Function to shrink an image by an integer factor by averaging blocks of pixels
+def downscale_pixels(pixels, target_width):
+    factor = max(1, pixels.shape[1] // target_width)
+    height = pixels.shape[0] // factor * factor
+    width = pixels.shape[1] // factor * factor
+    blocks = pixels[:height, :width].reshape(height // factor, factor, width // factor, factor, -1)
+    return blocks.mean(axis=(1, 3))
+
+# Function to lay out equally sized thumbnails on a grid
+def assemble_contact_sheet(thumbnails):
+    columns = math.ceil(math.sqrt(len(thumbnails)))  # Keep the sheet roughly square
+    rows = math.ceil(len(thumbnails) / columns)
+    thumb_height, thumb_width, channels = thumbnails[0].shape
+    sheet = np.zeros((rows * thumb_height, columns * thumb_width, channels), dtype=thumbnails[0].dtype)
+    for index, thumbnail in enumerate(thumbnails):
+        row, column = divmod(index, columns)
+        sheet[row * thumb_height:(row + 1) * thumb_height, column * thumb_width:(column + 1) * thumb_width] = thumbnail
+    return sheet
+
+# Depth above which a pixel is treated as world background (Cycles writes about 1e10 where a ray hits the HDRI)
+background_depth = 1e9
+
+# Function to warp an image rendered from source_matrix into the view of target_matrix using its depth pass.
+# Matrices are 4x4 camera-to-world transforms, depth is the distance from the camera plane (Blender's Z pass).
+# Background pixels are warped as points at infinity (only the camera rotation moves them) and keep their depth.
+# Returns the warped image and its depth; pixels nothing was projected onto have infinite depth.
+def reproject_image(colors, depth, source_matrix, target_matrix, focal_length, normals=None):
+    height, width = depth.shape
+    rows, columns = np.mgrid[0:height, 0:width]
+    depth = depth.astype(np.float64).ravel()
+    far = ~np.isfinite(depth) | (depth >= background_depth)
+    ray_depth = np.where(far, 1.0, depth)
+    x = (columns.ravel() + 0.5 - width / 2) / focal_length * ray_depth  # Cameras look down -Z with +Y up
+    y = -(rows.ravel() + 0.5 - height / 2) / focal_length * ray_depth
+    points = np.stack([x, y, -ray_depth, np.where(far, 0.0, 1.0)], axis=1)  # w = 0 makes far pixels directions
+    source_to_target = np.linalg.inv(target_matrix) @ source_matrix
+    target_points = points @ source_to_target.T
+    target_depth = -target_points[:, 2]
+    valid = target_depth > 1e-6
+    safe_depth = np.where(valid, target_depth, 1.0)
+    target_columns = np.floor(target_points[:, 0] / safe_depth * focal_length + width / 2).astype(np.int64)
+    target_rows = np.floor(height / 2 - target_points[:, 1] / safe_depth * focal_length).astype(np.int64)
+    valid &= (target_columns >= 0) & (target_columns < width) & (target_rows >= 0) & (target_rows < height)
+    if normals is not None:
+        # Drop surfaces that face away from the target camera, they cannot be visible there.
+        # The Normal pass is zero on the background, which has no facing and is always kept.
+        normals = normals.reshape(-1, 3)
+        surface = ~far & np.any(normals != 0, axis=1)
+        world_points = points[surface] @ np.asarray(source_matrix).T
+        to_camera = np.asarray(target_matrix)[:3, 3] - world_points[:, :3]
+        valid[surface] &= np.einsum('ij,ij->i', normals[surface], to_camera) > 0
+    target_depth = np.where(far, np.where(np.isfinite(depth), depth, background_depth * 10), target_depth)
+    candidates = np.nonzero(valid)[0]
+    candidates = candidates[np.argsort(target_depth[candidates], kind='stable')]  # Nearest points first
+    target_index = target_rows[candidates] * width + target_columns[candidates]
+    target_index, first = np.unique(target_index, return_index=True)  # Z-buffer: keep the nearest point per pixel
+    winners = candidates[first]
+    channels = colors.shape[-1]
+    warped_colors = np.zeros((height * width, channels), dtype=colors.dtype)
+    warped_depth = np.full(height * width, np.inf)
+    warped_colors[target_index] = colors.reshape(-1, channels)[winners]
+    warped_depth[target_index] = target_depth[winners]
+    return warped_colors.reshape(height, width, channels), warped_depth.reshape(height, width)
+
+# Function to fill holes (infinite depth) with the farthest valid neighbour, so disocclusions take the background
+def fill_holes_from_neighbours(colors, depth, max_iterations=16):
+    colors = colors.copy()
+    depth = depth.copy()
+    height, width = depth.shape
+    for _ in range(max_iterations):
+        holes = np.isinf(depth)
+        if not holes.any():
+            break
+        padded_depth = np.pad(depth, 1, constant_values=np.inf)
+        padded_colors = np.pad(colors, ((1, 1), (1, 1), (0, 0)), mode='edge')
+        best_depth = np.full(depth.shape, -np.inf)
+        best_colors = np.zeros_like(colors)
+        for dy in range(3):
+            for dx in range(3):
+                neighbour_depth = padded_depth[dy:dy + height, dx:dx + width]
+                take = np.isfinite(neighbour_depth) & (neighbour_depth > best_depth)
+                best_depth = np.where(take, neighbour_depth, best_depth)
+                best_colors[take] = padded_colors[dy:dy + height, dx:dx + width][take]
+        fill = holes & np.isfinite(best_depth)
+        colors[fill] = best_colors[fill]
+        depth[fill] = best_depth[fill]
+    return colors, depth
+
+# Function to measure the peak signal-to-noise ratio (in dB) of the RGB channels between two images with values
+# in 0-1, over the pixels in mask (e.g. foreground_mask) or the whole frame when mask is None or empty
+def psnr(image, reference, mask=None):
+    difference = image[..., :3] - reference[..., :3]
+    if mask is not None and mask.any():
+        difference = difference[mask]
+    mse = float(np.mean(difference ** 2))
+    return float('inf') if mse == 0 else 10 * math.log10(1.0 / mse)
+
+# Function to average a frame with neighbouring frames reprojected into its view, rejecting disoccluded pixels.
+# neighbours is a list of (colors, depth, camera_matrix); a neighbour pixel is only used where its reprojected
+# depth agrees with the frame's own depth within depth_tolerance (relative).
+def accumulate_temporal_frame(colors, depth, camera_matrix, neighbours, focal_length, depth_tolerance=0.02):
+    total = colors.astype(np.float64)
+    weight = np.ones(depth.shape)
+    for neighbour_colors, neighbour_depth, neighbour_matrix in neighbours:
+        warped_colors, warped_depth = reproject_image(neighbour_colors, neighbour_depth, neighbour_matrix,
+                                                      camera_matrix, focal_length)
+        accept = np.isfinite(warped_depth) & (np.abs(warped_depth - depth) <= depth_tolerance * depth)
+        total[accept] += warped_colors[accept]
+        weight[accept] += 1
+    return (total / weight[..., None]).astype(colors.dtype)
+
+# Function to mark the pixels of a depth pass that show geometry rather than the world background
+def foreground_mask(depth):
+    return np.isfinite(depth) & (depth < background_depth)
+
+# Function to measure the root-mean-square error of the RGB channels between two images with values in 0-1,
+# over the pixels in mask (e.g. foreground_mask) or the whole frame when mask is None or empty
+def rmse(image, reference, mask=None):
+    difference = image[..., :3] - reference[..., :3]
+    if mask is not None and mask.any():
+        difference = difference[mask]
+    return math.sqrt(float(np.mean(difference ** 2)))
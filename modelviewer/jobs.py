@@ -0,0 +1,25 @@
+#Finding the meshes of a batch and sharing them between workers. Plain Python, no bpy.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+
+# File types the pipeline can import
+mesh_extensions = (".obj", ".stl", ".glb")
+
+# Function to list every mesh file of the batch as sorted 'subfolder/mesh_file' names
+def list_mesh_files(main_folder_path):
+    mesh_files = []
+    for subfolder_name in sorted(os.listdir(main_folder_path)):
+        subfolder_path = os.path.join(main_folder_path, subfolder_name)
+        if os.path.isdir(subfolder_path):
+            mesh_files += [f"{subfolder_name}/{f}" for f in sorted(os.listdir(subfolder_path)) if f.endswith(mesh_extensions)]
+    return mesh_files
+
+# Function to pick the meshes of one worker: every worker_count-th mesh of the sorted batch
+def assign_meshes(mesh_files, worker_index, worker_count):
+    return mesh_files[worker_index::worker_count]
+
+# Function to read a text file of 'subfolder/mesh_file' lines
+def read_mesh_list(mesh_list_path):
+    with open(mesh_list_path) as mesh_list_file:
+        return [line.strip() for line in mesh_list_file if line.strip()]
@@ -0,0 +1,114 @@
+#Mesh import and preparation, and placing the camera for a mesh.
+
+# Import necessary modules
+import bpy  # Blender Python API for scripting
+from mathutils import Vector  # Blender math utilities for working with vectors
+from .geometry import bounding_box_size, camera_distance_for_size, fit_scale_factor
+
+# Function to delete every mesh object in the scene
+def clear_meshes():
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.ops.object.select_by_type(type='MESH')
+    bpy.ops.object.delete()
+
+# Function to import a mesh file using the appropriate method and return it as a single mesh object
+def import_mesh(mesh_file_path):
+    if mesh_file_path.endswith(".obj"):
+        bpy.ops.wm.obj_import(filepath=mesh_file_path)
+    elif mesh_file_path.endswith(".stl"):
+        bpy.ops.wm.stl_import(filepath=mesh_file_path)
+    elif mesh_file_path.endswith(".glb"):
+        bpy.ops.wm.gltf_import(filepath=mesh_file_path)
+    print(f"Imported {mesh_file_path} successfully.")
+
+    # Combine all imported objects into one
+    combine_objects()
+
+    # Get the imported mesh object
+    imported_objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
+    if not imported_objects:
+        raise RuntimeError("No mesh object was imported.")
+    return imported_objects[0]
+
+# Function to give the mesh a material, fit it into target_size, turn it upright and smooth its shading
+def prepare_mesh(mesh_object, target_size):
+    # Add a basic material to the mesh if it doesn't have one
+    if not mesh_object.data.materials:
+        mat = bpy.data.materials.new(name="BasicMaterial")
+        mat.diffuse_color = (0.8, 0.8, 0.8, 1)  # Light gray color
+        mesh_object.data.materials.append(mat)
+
+    # Process each mesh individually
+    fit_mesh_to_bounding_box(mesh_object, Vector(target_size))
+    correct_mesh_orientation(mesh_object)
+
+    # Apply smooth shading to the mesh
+    bpy.context.view_layer.objects.active = mesh_object
+    bpy.ops.object.shade_smooth()
+
+# Function to remove a mesh object once it has been rendered
+def remove_mesh(mesh_object):
+    # Ensure the object is removed correctly to avoid errors
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.context.view_layer.objects.active = None
+    bpy.data.objects.remove(mesh_object)
+
+# Function to combine all selected mesh objects into a single object
+def combine_objects():
+    bpy.ops.object.select_all(action='DESELECT')  # Deselect all objects
+    bpy.ops.object.select_by_type(type='MESH')  # Select all mesh objects
+    bpy.ops.object.join()  # Join the selected meshes into one
+
+# Function to make a mesh's data unique, so it's independent from other objects
+def make_mesh_unique(mesh_object):
+    mesh_object.data = mesh_object.data.copy()  # Copy the mesh data to make it unique
+
+# Function to calculate the size of the mesh's bounding box in world coordinates
+def world_bounding_box_size(mesh_object):
+    bbox = [mesh_object.matrix_world @ Vector(corner) for corner in mesh_object.bound_box]  # Calculate the world coordinates of the bounding box corners
+    return bounding_box_size(bbox)
+
+# Function to fit a mesh into a defined bounding box size
+def fit_mesh_to_bounding_box(mesh_object, target_size):
+    make_mesh_unique(mesh_object)  # Make the mesh data unique
+    bpy.context.view_layer.objects.active = mesh_object  # Set the mesh as the active object
+    bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='BOUNDS')  # Set the object's origin to its center of mass
+    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)  # Apply location, rotation, and scale transformations
+    scale_factor = fit_scale_factor(world_bounding_box_size(mesh_object), target_size)  # Calculate the scaling factor and add padding
+    mesh_object.scale = [scale_factor] * 3  # Scale the mesh uniformly
+    bpy.ops.object.transform_apply(scale=True)  # Apply the scaling transformation
+
+# Function to correct the orientation of a mesh if it is upside down
+def correct_mesh_orientation(mesh_object):
+    make_mesh_unique(mesh_object)  # Make the mesh data unique
+    z_up_vector = Vector((0, 0, 1))  # Define the up vector along the Z-axis
+    up_axis = Vector((0, 0, 1))  # Define the axis that should be up
+    rotation = mesh_object.matrix_world.to_3x3().transposed()  # Get the transposed rotation matrix
+    up_vector = rotation @ up_axis  # Calculate the current up vector
+    if up_vector.dot(z_up_vector) < 0:  # Check if the mesh is upside down
+        bpy.context.view_layer.objects.active = mesh_object  # Set the mesh as the active object
+        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)  # Apply location, rotation, and scale transformations
+        mesh_object.rotation_euler.rotate_axis('X', 3.14159)  # Rotate the mesh 180 degrees around the X-axis to correct orientation
+
+# Function to dynamically adjust the camera distance based on the bounding box size
+def adjust_camera_distance(mesh_object, base_distance=10, padding_factor=1.5):
+    max_dim = max(world_bounding_box_size(mesh_object))  # Find the largest dimension of the bounding box
+    return camera_distance_for_size(max_dim, base_distance, padding_factor)  # Calculate the camera distance with padding
+
+# Function to center the mesh in the camera view
+def center_mesh_in_camera_view(camera, mesh_object):
+    bpy.context.view_layer.objects.active = mesh_object  # Set the mesh as the active object
+    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')  # Set the object's origin to its bounding box center
+    camera_constraint = camera.constraints.new(type='TRACK_TO')  # Add a constraint to track the object
+    camera_constraint.target = mesh_object  # Set the target of the constraint to the mesh
+    camera_constraint.track_axis = 'TRACK_NEGATIVE_Z'  # Set the camera to track along the negative Z-axis
+    camera_constraint.up_axis = 'UP_Y'  # Set the up axis to Y
+    bpy.context.scene.camera = camera  # Set the camera as the active camera
+    bpy.context.view_layer.update()  # Update the view layer
+
+# Function to set up the camera for rendering
+def setup_camera_for_rendering(camera, mesh_object):
+    adjusted_distance = adjust_camera_distance(mesh_object)  # Adjust the camera distance based on the mesh size
+    center_mesh_in_camera_view(camera, mesh_object)  # Center the mesh in the camera view
+    camera.location.z = mesh_object.location.z + adjusted_distance  # Position the camera above the mesh
+    return adjusted_distance  # Return the adjusted camera distance
@@ -0,0 +1,81 @@
+#Processing of one mesh from import to stills and turntables; the scene is built on the first job and reused.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import time  # Standard Python module used to time each mesh
+from . import config
+from .geometry import turntable_camera_positions
+from .meshes import clear_meshes, import_mesh, prepare_mesh, remove_mesh, setup_camera_for_rendering
+from .rendering import render_flexible_frames
+from .scene import ensure_scene, get_still_writer
+from .stereo import render_synthesized_stereo_turntables
+from .temporal import calibrate_temporal_samples
+from .textures import optimize_mesh_textures
+from .turntable import render_stereoscopic_turntable
+
+# Function to render one 'subfolder/mesh_file' of the batch and return its timings.
+# workload is 'all', 'stills' or 'turntable'; setup_seconds is the per-job overhead (import, fitting, textures).
+def process_mesh(main_folder_path, mesh_name, workload="all"):
+    camera = ensure_scene()
+    mesh_start_time = time.perf_counter()
+    subfolder_name, mesh_file = mesh_name.split("/", 1)
+
+    # Create an output folder for each subfolder
+    subfolder_output_path = os.path.join(config.output_path, subfolder_name)
+    os.makedirs(subfolder_output_path, exist_ok=True)
+
+    # Clear the scene before processing the new mesh, then import and prepare it
+    clear_meshes()
+    mesh_object = import_mesh(os.path.join(main_folder_path, subfolder_name, mesh_file))
+    mesh_object_name = mesh_object.name
+    prepare_mesh(mesh_object, config.target_size)
+    adjusted_distance = setup_camera_for_rendering(camera, mesh_object)
+
+    # Replace large textures with cached copies sized to the mesh's screen coverage
+    if config.use_texture_cache:
+        optimize_mesh_textures(mesh_object, adjusted_distance)
+    setup_end_time = time.perf_counter()
+
+    if workload in ("all", "stills"):
+        render_flexible_frames(subfolder_name, mesh_object.name, subfolder_output_path, config.num_positions, adjusted_distance)
+        if config.use_async_still_writer:
+            get_still_writer().flush()  # Count the background writes as part of the stills time
+    stills_end_time = time.perf_counter()
+
+    if workload in ("all", "turntable"):
+        # Find the lowest turntable sample count that stays within the error bound for this mesh (None renders normally)
+        temporal_samples = None
+        if config.use_temporal_accumulation:
+            temporal_samples = calibrate_temporal_samples(turntable_camera_positions(mesh_object.location, config.total_frames, adjusted_distance))
+
+        # Render stereoscopic turntables for different interocular distances (IODs)
+        if config.use_stereo_synthesis:
+            render_synthesized_stereo_turntables(subfolder_name, mesh_object, subfolder_output_path, config.total_frames, adjusted_distance,
+                                                 [iod / 1000 for iod in config.interocular_distances], temporal_samples)
+        else:
+            for iod in config.interocular_distances:
+                render_stereoscopic_turntable(subfolder_name, mesh_object, subfolder_output_path, config.total_frames, adjusted_distance,
+                                              eye_distance=iod / 1000, temporal_samples=temporal_samples)
+    turntable_end_time = time.perf_counter()
+
+    # Now, after all operations, delete the mesh object
+    remove_mesh(mesh_object)
+    print(f"Deleted {mesh_object_name}.")
+    return {
+        "mesh": mesh_name,
+        "setup_seconds": setup_end_time - mesh_start_time,
+        "stills_seconds": stills_end_time - setup_end_time,
+        "turntable_seconds": turntable_end_time - stills_end_time,
+        "turntable_frames": config.total_frames,
+    }
+
+# Function to render a list of 'subfolder/mesh_file' names and return the timings of each mesh
+def process_meshes(main_folder_path, mesh_names, workload="all"):
+    mesh_timings = []
+    for mesh_name in mesh_names:
+        print(f"Processing {mesh_name}")
+        mesh_timings.append(process_mesh(main_folder_path, mesh_name, workload))
+    # Clean up and remove any leftover imported objects
+    if mesh_timings:
+        clear_meshes()
+    return mesh_timings
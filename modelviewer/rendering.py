@@ -0,0 +1,104 @@
+#Rendering of still views and single frames with their passes, and encoding frame sequences into videos.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import bpy  # Blender Python API for scripting
+import numpy as np  # NumPy ships with Blender and is used to handle rendered pixel buffers
+from . import config
+from .geometry import generate_camera_positions
+from .writer import derivative_extensions
+from .scene import (get_camera, get_still_writer, grab_render_pixels, read_render_pass, set_pass_capture, view_settings_tuple,
+                    view_transform_supported)
+
+# Function to render a frame from a specific camera position
+def render_frame(mesh_name, position_name, position, output_path):
+    camera = get_camera()
+    bpy.context.scene.render.image_settings.file_format = 'PNG'  # Set the output file format to PNG
+    camera.location = position  # Move the camera to the specified position
+    camera.keyframe_insert(data_path="location", frame=1)  # Insert a keyframe for camera position
+    bpy.context.scene.frame_set(1)  # Set the frame to 1
+    render_filepath = os.path.join(output_path, f"{mesh_name}_{position_name}.png")  # Define the output path for the render
+    # The writer pool reproduces only the Raw and Standard view transforms; others are saved by Blender itself
+    if config.use_async_still_writer and view_transform_supported():
+        bpy.ops.render.render(write_still=False)  # Render only; the writer pool encodes and saves the image
+        contact_sheet_path = os.path.join(output_path, f"{mesh_name}_contact_sheet.png") if config.make_contact_sheet else None
+        still_writer = get_still_writer()
+        still_writer.submit(grab_render_pixels, render_filepath, view_settings_tuple(), contact_sheet_path)
+        if config.still_derivative_formats and not still_writer.derivative_formats:
+            save_render_derivatives(render_filepath)  # Pillow is missing, so the writer threads cannot encode them
+        print(f"Rendered {position_name} view of {mesh_name}, queued for writing to {render_filepath}")
+        return
+    bpy.context.scene.render.filepath = render_filepath  # Set the render file path
+    bpy.ops.render.render(write_still=True)  # Render the image and save it
+    if config.still_derivative_formats:
+        save_render_derivatives(render_filepath)
+    print(f"Rendered {position_name} view of {mesh_name} to {render_filepath}")
+
+# Function to save WebP/JPEG copies of the last render next to render_filepath with Blender's own image writers
+def save_render_derivatives(render_filepath):
+    scene = bpy.context.scene
+    image_settings = scene.render.image_settings
+    previous_settings = (image_settings.file_format, image_settings.color_mode, image_settings.quality)
+    try:
+        for derivative_format in config.still_derivative_formats:
+            image_settings.file_format = derivative_format
+            image_settings.color_mode = 'RGB'
+            image_settings.quality = config.still_derivative_quality
+            derivative_filepath = os.path.splitext(render_filepath)[0] + derivative_extensions[derivative_format]
+            bpy.data.images['Render Result'].save_render(filepath=derivative_filepath, scene=scene)
+    finally:
+        image_settings.file_format, image_settings.color_mode, image_settings.quality = previous_settings
+
+# Function to render multiple frames from different camera positions
+def render_flexible_frames(subfolder_name, mesh_name, output_path, num_positions, distance):
+    camera_positions = generate_camera_positions(num_positions, distance)  # Generate camera positions
+    for position_name, position in camera_positions.items():  # Iterate over the generated positions
+        render_frame(mesh_name, position_name, position, output_path)  # Render a frame for each position
+    if config.use_async_still_writer and config.make_contact_sheet:
+        get_still_writer().finish_contact_sheet(os.path.join(output_path, f"{mesh_name}_contact_sheet.png"))
+
+# Function to render the current scene from location and return the image, the requested passes and the camera matrix
+def render_view_with_passes(location, passes):
+    camera = get_camera()
+    camera.location = location  # Move the camera; the Track To constraint keeps it aimed at the mesh
+    bpy.context.view_layer.update()  # Evaluate the constraint so matrix_world is up to date
+    camera_matrix = np.array(camera.matrix_world, dtype=np.float64)
+    set_pass_capture(bool(passes))  # Only compute and write the passes when they are read back
+    try:
+        bpy.ops.render.render(write_still=False)
+    finally:
+        set_pass_capture(False)
+    view = {'Image': grab_render_pixels()}
+    for pass_name in passes:
+        view[pass_name] = read_render_pass(pass_name, channels=3 if pass_name == 'Normal' else 1)
+    return view, camera_matrix
+
+# Function to set the video output settings used for all turntable videos
+def apply_video_settings(scene):
+    scene.render.image_settings.file_format = 'FFMPEG'
+    scene.render.ffmpeg.format = 'MPEG4'
+    scene.render.ffmpeg.codec = 'H264'  # AV1
+    scene.render.ffmpeg.constant_rate_factor = 'MEDIUM' # LOSSLESS, HIGH, PERC_LOSELESS, MEDIUM, LOW, LOWEST
+    scene.render.ffmpeg.ffmpeg_preset = 'BEST'  #BEST, GOOD, REALTIME
+
+# Function to encode a sequence of PNG frames into a video using a temporary sequencer scene
+def encode_frames_to_video(frame_paths, video_filepath):
+    scene = bpy.context.scene
+    video_scene = bpy.data.scenes.new("FrameEncoder")  # Separate scene so the main scene is left untouched
+    video_scene.render.resolution_x = scene.render.resolution_x
+    video_scene.render.resolution_y = scene.render.resolution_y
+    video_scene.render.resolution_percentage = scene.render.resolution_percentage
+    video_scene.render.fps = scene.render.fps
+    video_scene.view_settings.view_transform = 'Standard'  # The frames are already display-referred
+    video_scene.view_settings.look = 'None'
+    apply_video_settings(video_scene)
+    video_scene.sequence_editor_create()
+    strip = video_scene.sequence_editor.sequences.new_image(name="Frames", filepath=frame_paths[0], channel=1, frame_start=1)
+    for frame_path in frame_paths[1:]:
+        strip.elements.append(os.path.basename(frame_path))  # All frames live in the same folder
+    video_scene.frame_start = 1
+    video_scene.frame_end = len(frame_paths)
+    video_scene.render.filepath = video_filepath
+    bpy.ops.render.render(animation=True, scene=video_scene.name)
+    bpy.data.scenes.remove(video_scene)
+    print(f"Encoded {len(frame_paths)} frames to {video_filepath}")
@@ -0,0 +1,258 @@
+#Scene construction: render settings, HDRI lighting, colour management, camera, lights and the compositor capture.
+#Nothing is built at import time; ensure_scene() sets the scene up on first use and returns the camera.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import shutil  # Standard Python module for removing temporary pass files
+import bpy  # Blender Python API for scripting
+import numpy as np  # NumPy ships with Blender and is used to handle rendered pixel buffers
+from . import config
+from .geometry import focal_length_in_pixels
+from .imaging import supported_view_transforms
+from .writer import StillWriterPool
+
+# Objects created by ensure_scene(), kept for the lifetime of this Blender process
+_camera = None
+_still_writer = None
+
+# Function to set up HDRI environment lighting in the scene
+def setup_hdri_lighting(hdri_path):
+    world = bpy.context.scene.world  # Access the world settings of the current scene
+    world.use_nodes = True  # Enable node-based environment lighting
+    nodes = world.node_tree.nodes  # Access the nodes in the world node tree
+    links = world.node_tree.links  # Access the links (connections) between nodes
+    
+    # Clear any existing nodes in the world node tree
+    nodes.clear()
+    
+    # Add an Environment Texture node to use the HDRI for lighting
+    env_texture_node = nodes.new(type='ShaderNodeTexEnvironment')
+    env_texture_node.image = bpy.data.images.load(hdri_path)  # Load the HDRI file
+    
+    # Add Mapping and Texture Coordinate nodes to control HDRI placement and rotation
+    mapping_node = nodes.new(type='ShaderNodeMapping')
+    tex_coord_node = nodes.new(type='ShaderNodeTexCoord')
+    
+    # Connect the Texture Coordinate node to the Mapping node, and then to the Environment Texture node
+    links.new(tex_coord_node.outputs['Generated'], mapping_node.inputs['Vector'])
+    links.new(mapping_node.outputs['Vector'], env_texture_node.inputs['Vector'])
+    
+    # Add a Background node to hold the HDRI lighting
+    background_node = nodes.new(type='ShaderNodeBackground')
+    background_node.inputs['Strength'].default_value = 1.0  # Set the initial brightness of the HDRI
+    
+    # Link the Environment Texture node to the Background node
+    links.new(env_texture_node.outputs['Color'], background_node.inputs['Color'])
+    
+    # Add the Output node to connect the Background node to the world output
+    output_node = nodes.new(type='ShaderNodeOutputWorld')
+    links.new(background_node.outputs['Background'], output_node.inputs['Surface'])
+
+# Function to set up color management settings for the scene
+def setup_color_management():
+    bpy.context.scene.view_settings.view_transform = 'Raw'  # Use 'Raw' to prevent color correction
+    bpy.context.scene.view_settings.look = 'None'  # No additional look applied
+    bpy.context.scene.view_settings.exposure = -0.426  # Adjust exposure to control brightness
+    bpy.context.scene.view_settings.gamma = 1.567  # Adjust gamma for contrast
+
+# Function to route the rendered image to a Viewer node so its pixels can be read back from Python,
+# and prepare a File Output node writing extra passes (e.g. 'Depth', 'Normal') to EXR files in capture_path.
+# The passes stay off until set_pass_capture switches them on for a render that reads them.
+def setup_render_capture(passes=()):
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    view_layer.use_pass_z = 'Depth' in passes  # Distance from the camera plane
+    view_layer.use_pass_normal = 'Normal' in passes  # World-space surface normals
+    scene.use_nodes = True  # Enable the compositor
+    nodes = scene.node_tree.nodes
+    links = scene.node_tree.links
+    nodes.clear()  # Start from an empty compositor node tree
+    render_layers_node = nodes.new(type='CompositorNodeRLayers')  # Provides the rendered passes
+    composite_node = nodes.new(type='CompositorNodeComposite')  # Keeps animation renders working as before
+    viewer_node = nodes.new(type='CompositorNodeViewer')  # Exposes the result as the 'Viewer Node' image
+    viewer_node.use_alpha = True
+    links.new(render_layers_node.outputs['Image'], composite_node.inputs['Image'])
+    links.new(render_layers_node.outputs['Image'], viewer_node.inputs['Image'])
+    if passes:
+        file_output_node = nodes.new(type='CompositorNodeOutputFile')  # Writes the extra passes as float EXR files
+        file_output_node.base_path = config.capture_path
+        file_output_node.format.file_format = 'OPEN_EXR'
+        file_output_node.format.color_depth = '32'
+        file_output_node.format.color_mode = 'RGB'
+        file_output_node.file_slots.clear()
+        for pass_name in passes:
+            file_output_node.file_slots.new(pass_name)
+            links.new(render_layers_node.outputs[pass_name], file_output_node.inputs[pass_name])
+        file_output_node.name = "Pass Output"
+    set_pass_capture(False)
+
+# Function to switch the extra passes and their EXR output on or off, so stills and animation renders that
+# do not read the passes neither compute nor write them
+def set_pass_capture(enabled):
+    passes = config.capture_passes() if enabled else []
+    view_layer = bpy.context.view_layer
+    view_layer.use_pass_z = 'Depth' in passes  # Distance from the camera plane
+    view_layer.use_pass_normal = 'Normal' in passes  # World-space surface normals
+    node_tree = bpy.context.scene.node_tree
+    file_output_node = node_tree.nodes.get("Pass Output") if node_tree else None
+    if file_output_node is not None:
+        file_output_node.mute = not enabled
+
+# Function to copy the last rendered image into a NumPy array (rows ordered top to bottom)
+def grab_render_pixels():
+    viewer_image = bpy.data.images['Viewer Node']  # Image written by the Viewer node after each render
+    width, height = viewer_image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    viewer_image.pixels.foreach_get(pixels)  # Fast bulk copy of the float RGBA buffer
+    return pixels.reshape(height, width, 4)[::-1].copy()  # Blender stores the bottom row first
+
+# Function to load a pass written by setup_render_capture for the current frame (rows ordered top to bottom)
+def read_render_pass(pass_name, channels=1):
+    pass_filepath = os.path.join(config.capture_path, f"{pass_name}{bpy.context.scene.frame_current:04d}.exr")
+    pass_image = bpy.data.images.load(pass_filepath)
+    pass_image.colorspace_settings.name = 'Non-Color'  # Read the stored values without colour conversion
+    width, height = pass_image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    pass_image.pixels.foreach_get(pixels)
+    bpy.data.images.remove(pass_image)  # Free the datablock, the data now lives in NumPy
+    os.remove(pass_filepath)
+    pixels = pixels.reshape(height, width, 4)[::-1]
+    return pixels[..., 0].copy() if channels == 1 else pixels[..., :channels].copy()
+
+# Function to apply the render engine, resolution, frame rate and performance settings from config
+def setup_render_settings():
+    scene = bpy.context.scene
+    scene.render.fps = config.frame_rate  # Set the scene's frame rate
+    scene.render.resolution_x = config.resolution_x  # Set the horizontal resolution
+    scene.render.resolution_y = config.resolution_y  # Set the vertical resolution
+    scene.render.film_transparent = False  # Disable transparency to ensure the background is not transparent
+
+    # Use the Cycles render engine (Blender's ray-tracing engine)
+    scene.render.engine = 'CYCLES'  # Set the render engine to Cycles
+    scene.cycles.samples = config.samples  # Set the number of samples for rendering (higher is better quality)
+    scene.cycles.use_adaptive_sampling = True  # Enable adaptive sampling to reduce render times
+
+    # CPU threads, tile size and persistent data (chosen per machine by 'batch_runner.py autotune')
+    if config.render_threads:
+        scene.render.threads_mode = 'FIXED'  # Use exactly the requested number of threads
+        scene.render.threads = config.render_threads
+    if config.tile_size:
+        scene.cycles.use_auto_tile = True
+        scene.cycles.tile_size = config.tile_size
+    scene.render.use_persistent_data = config.use_persistent_data  # Reuse scene data between renders
+
+    # Uncomment the following lines to use the Eevee render engine instead (Blender's real-time engine)
+    # scene.render.engine = 'BLENDER_EEVEE'
+    # scene.eevee.taa_render_samples = 64  # Set the number of samples for Eevee
+    # scene.eevee.use_gtao = False  # Disable Ambient Occlusion in Eevee
+    # scene.eevee.use_bloom = False  # Disable Bloom in Eevee
+    # scene.eevee.use_ssr = False  # Disable Screen Space Reflections in Eevee
+
+# Function to create the render camera
+def create_camera():
+    # Create a camera in the scene at the specified location
+    bpy.ops.object.camera_add(location=(0, 0, 10))
+    camera = bpy.context.object  # Store the created camera object
+    camera.name = 'Camera.001'  # Name the camera
+
+    # Set the created camera as the active camera for rendering
+    bpy.context.scene.camera = camera
+
+    # Zoom in the camera by adjusting the focal length
+    camera.data.lens = 70  # Set the camera's focal length to 70mm
+
+    # Disable Depth of Field to avoid blurriness in the render
+    camera.data.dof.use_dof = False
+    return camera
+
+# Function to add the area, sun and point lights around the mesh position
+def create_lights():
+    # Add a soft area light to the scene for additional lighting
+    bpy.ops.object.light_add(type='AREA', location=(5, 5, 5))
+    area_light = bpy.context.object  # Store the created light object
+    area_light.data.energy = 100  # Set the light's energy (brightness)
+    area_light.data.size = 10  # Set the size of the light to create soft shadows
+    area_light.data.use_shadow = False  # Disable shadows for this light
+
+    # Add a sun lamp for directional light
+    bpy.ops.object.light_add(type='SUN', location=(10, 10, 10))
+    sun_light = bpy.context.object  # Store the created sun lamp object
+    sun_light.data.energy = 1  # Set the sun lamp's energy (brightness)
+    sun_light.data.use_shadow = False  # Disable shadows for this light
+
+    # Add point lights around the object for better illumination
+    point_light_positions = [
+        (5, 5, 10),
+        (-5, -5, 10),
+        (-5, 5, 10),
+        (5, -5, 10)
+    ]
+
+    # Create point lights at the specified positions
+    for position in point_light_positions:
+        bpy.ops.object.light_add(type='POINT', location=position)
+        point_light = bpy.context.object  # Store the created point light object
+        point_light.data.energy = 50  # Set the point light's energy (brightness)
+        point_light.data.use_shadow = False  # Disable shadows for these lights
+
+# Function to build the scene on first use and return the camera; later calls return the same camera
+def ensure_scene():
+    global _camera, _still_writer
+    if _camera is not None:
+        return _camera
+    os.makedirs(config.output_path, exist_ok=True)  # Ensure the output directory exists
+    setup_render_settings()
+    setup_hdri_lighting(config.hdri_path)  # Set up the HDRI environment lighting using the specified HDRI file
+    setup_color_management()  # Apply the color management settings
+    if (config.use_stereo_synthesis or config.use_temporal_accumulation) and not view_transform_supported():
+        raise RuntimeError("Stereo synthesis and temporal accumulation need the 'Raw' or 'Standard' view transform "
+                           "without a look, because their frames are colour managed outside Blender")
+    # Set up the compositor capture and the background writer pool for still images and synthesised frames
+    if config.uses_frame_capture():
+        setup_render_capture(config.capture_passes())
+        _still_writer = StillWriterPool(config.still_writer_threads, config.still_writer_max_pending,
+                                        config.still_color_depth, config.still_png_compression,
+                                        config.still_derivative_formats, config.still_derivative_quality,
+                                        config.contact_sheet_thumb_width)
+    _camera = create_camera()
+    create_lights()
+    return _camera
+
+# Function to return the render camera, building the scene if needed
+def get_camera():
+    return ensure_scene()
+
+# Function to return the background writer pool (None when pixels are not read back into Python)
+def get_still_writer():
+    ensure_scene()
+    return _still_writer
+
+# Function to wait for the background writers and remove temporary files
+def shutdown():
+    if _still_writer is not None:
+        _still_writer.close()  # Wait for the background writers to finish saving every image
+    shutil.rmtree(config.capture_path, ignore_errors=True)  # Remove this process's leftover pass files
+    try:
+        os.rmdir(os.path.dirname(config.capture_path))  # Remove the shared _passes folder once no worker uses it
+    except OSError:
+        pass
+
+# Function to calculate the focal length in pixels of the scene camera at the current render resolution
+def scene_focal_length():
+    camera = get_camera()
+    render = bpy.context.scene.render
+    width = render.resolution_x * render.resolution_percentage // 100
+    height = render.resolution_y * render.resolution_percentage // 100
+    return focal_length_in_pixels(camera.data.lens, camera.data.sensor_width, camera.data.sensor_height,
+                                  camera.data.sensor_fit, width, height)
+
+# Function to tell whether imaging.apply_view_transform reproduces the scene's colour management exactly
+def view_transform_supported():
+    view_settings = bpy.context.scene.view_settings
+    return (view_settings.view_transform in supported_view_transforms and view_settings.look in ('None', '')
+            and not view_settings.use_curve_mapping)
+
+# Function to return the (view_transform, exposure, gamma) tuple used to convert rendered pixels for display
+def view_settings_tuple():
+    view_settings = bpy.context.scene.view_settings
+    return (view_settings.view_transform, view_settings.exposure, view_settings.gamma)
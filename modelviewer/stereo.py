@@ -0,0 +1,120 @@
+#Stereoscopic turntables synthesised from a single centre-eye turntable by depth-based reprojection.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import shutil  # Standard Python module for removing temporary frame folders
+import bpy  # Blender Python API for scripting
+import numpy as np  # NumPy ships with Blender and is used to handle rendered pixel buffers
+from . import config
+from .geometry import turntable_camera_positions
+from .imaging import apply_view_transform, fill_holes_from_neighbours, foreground_mask, psnr, reproject_image
+from .rendering import encode_frames_to_video, render_view_with_passes
+from .scene import get_camera, get_still_writer, scene_focal_length, view_settings_tuple
+from .temporal import turntable_views
+
+# Function to produce stereoscopic turntables for several IODs from one centre-eye turntable.
+# Each eye is synthesised by depth-based reprojection of the centre view; disocclusion holes are filled from
+# true eye renders at the widest IOD every stereo_keyframe_interval frames, which also provide the quality report.
+# Only those keyframes are kept in memory; validation references are rendered (image only) one frame at a time.
+# temporal_samples enables temporal accumulation of the centre-eye frames at that sample count.
+def render_synthesized_stereo_turntables(subfolder_name, mesh_object, output_path, frame_count, radius, eye_distances,
+                                         temporal_samples=None):
+    scene = bpy.context.scene
+    camera = get_camera()
+    still_writer = get_still_writer()
+    mesh_name = mesh_object.name
+    camera.animation_data_clear()  # Camera locations are set directly for each rendered view
+    scene.frame_set(1)
+    focal_length = scene_focal_length()
+    view = view_settings_tuple()
+    passes = ['Depth', 'Normal']
+    sides = {'left': -1, 'right': 1}
+    widest = max(eye_distances)
+    center = tuple(mesh_object.location)
+    centre_positions = turntable_camera_positions(center, frame_count, radius)
+    eye_positions = {(side, eye_distance): turntable_camera_positions(center, frame_count, radius, sign * eye_distance / 2)
+                     for side, sign in sides.items() for eye_distance in eye_distances}
+
+    # Render the true eye keyframes at the widest IOD, used to fill disocclusions
+    keyframes = list(range(1, frame_count + 1, config.stereo_keyframe_interval))
+    keyframe_views = {(side, frame): render_view_with_passes(eye_positions[(side, widest)][frame - 1], passes)
+                      for side in sides for frame in keyframes}
+    print(f"Rendered {len(keyframe_views)} true eye keyframes of {mesh_name}")
+    full_samples = scene.cycles.samples  # Temporal accumulation lowers the samples while the centre frames render
+
+    # Function to return the true render of an eye to compare the synthesised frame with, or None.
+    # Keyframes are reused; when validating, every other frame is rendered here without passes at full samples.
+    def true_view(side, eye_distance, frame):
+        if eye_distance == widest and (side, frame) in keyframe_views:
+            return keyframe_views[(side, frame)]
+        if not config.stereo_synthesis_validation:
+            return None
+        samples = scene.cycles.samples
+        scene.cycles.samples = full_samples
+        try:
+            return render_view_with_passes(eye_positions[(side, eye_distance)][frame - 1], [])
+        finally:
+            scene.cycles.samples = samples
+
+    # Function to pick the true widest-IOD keyframe of a side closest in the turntable to frame, excluding exclude_frame
+    def nearest_true_view(side, frame, exclude_frame=None):
+        candidates = [keyframe for keyframe in keyframes if keyframe != exclude_frame]
+        if not candidates:
+            return None
+        nearest = min(candidates, key=lambda keyframe: min(abs(keyframe - frame), frame_count - abs(keyframe - frame)))
+        return keyframe_views[(side, nearest)]
+
+    frames_folder = os.path.join(output_path, f"{subfolder_name}{mesh_name}_stereo_frames")
+    os.makedirs(frames_folder, exist_ok=True)
+    frame_paths = {key: {} for key in eye_positions}
+    quality_rows = []
+    for frame, centre_view, centre_matrix in turntable_views(centre_positions, passes, temporal_samples):
+        for (side, eye_distance), positions in eye_positions.items():
+            camera.location = positions[frame - 1]
+            bpy.context.view_layer.update()
+            eye_matrix = np.array(camera.matrix_world, dtype=np.float64)
+            colors, depth = reproject_image(centre_view['Image'], centre_view['Depth'], centre_matrix, eye_matrix,
+                                            focal_length, centre_view['Normal'])
+            colors, depth = fill_holes_from_neighbours(colors, depth, max_iterations=1)  # Close one-pixel cracks
+            reference = true_view(side, eye_distance, frame)
+            # Fill disocclusions from a nearby true eye view that is not the reference for this frame
+            hole_fraction = float(np.mean(np.isinf(depth)))
+            fill = nearest_true_view(side, frame, exclude_frame=frame if reference is not None else None)
+            if fill is not None:
+                fill_view, fill_matrix = fill
+                fill_colors, fill_depth = reproject_image(fill_view['Image'], fill_view['Depth'], fill_matrix, eye_matrix,
+                                                          focal_length, fill_view['Normal'])
+                holes = np.isinf(depth) & np.isfinite(fill_depth)
+                colors[holes] = fill_colors[holes]
+                depth[holes] = fill_depth[holes]
+            colors, depth = fill_holes_from_neighbours(colors, depth)
+            # Anything still uncovered takes the pixel of the true keyframe (or the centre view) at the same position
+            remaining = np.isinf(depth)
+            if remaining.any():
+                colors[remaining] = (fill[0] if fill is not None else centre_view)['Image'][remaining]
+            if reference is not None:
+                # Compare the mesh only: the background barely changes between eyes and would hide disocclusion errors
+                foreground = foreground_mask(depth)
+                if 'Depth' in reference[0]:
+                    foreground |= foreground_mask(reference[0]['Depth'])
+                quality = psnr(apply_view_transform(colors, *view), apply_view_transform(reference[0]['Image'], *view), foreground)
+                quality_rows.append((frame, side, round(eye_distance * 1000), quality, hole_fraction))
+                print(f"Frame {frame} {side} eye {eye_distance * 1000:.0f}mm: PSNR {quality:.2f} dB against true render")
+                colors = reference[0]['Image']  # Use the true render in the output where one exists
+            frame_path = os.path.join(frames_folder, f"{side}{eye_distance}_{frame:04d}.png")
+            still_writer.submit(colors, frame_path, view, temporary=True)
+            frame_paths[(side, eye_distance)][frame] = frame_path
+    still_writer.flush()  # All frames must be on disk before encoding
+
+    for (side, eye_distance), paths in frame_paths.items():
+        video_filepath = os.path.join(output_path, f"{subfolder_name}{mesh_name}_turntable_{side}{eye_distance}mm.mp4")
+        encode_frames_to_video([paths[frame] for frame in sorted(paths)], video_filepath)
+    shutil.rmtree(frames_folder)
+
+    # Write the per-frame quality report
+    report_filepath = os.path.join(output_path, f"{subfolder_name}{mesh_name}_stereo_synthesis_quality.csv")
+    with open(report_filepath, 'w') as report_file:
+        report_file.write("frame,eye,iod_mm,psnr_db,hole_fraction\n")
+        for row in sorted(quality_rows):
+            report_file.write("%d,%s,%d,%.3f,%.5f\n" % row)
+    print(f"Rendered synthesised stereoscopic turntables of {mesh_name}, quality report in {report_filepath}")
@@ -0,0 +1,117 @@
+#Turntable frame rendering with optional temporal accumulation: frames are rendered at a reduced sample count
+#and averaged with their neighbours reprojected through the known camera path and the depth pass.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import shutil  # Standard Python module for removing temporary frame folders
+import bpy  # Blender Python API for scripting
+from . import config
+from .imaging import accumulate_temporal_frame, apply_view_transform, foreground_mask, rmse
+from .rendering import encode_frames_to_video, render_view_with_passes
+from .scene import get_camera, get_still_writer, scene_focal_length, view_settings_tuple
+
+# Function to render every frame of a turntable at the given camera locations, yielding (frame, view, camera_matrix).
+# When temporal_samples is given, frames are rendered at that sample count and each yielded view is the average
+# of the frame with its temporal_radius neighbours on either side (the turntable wraps around), so frames are
+# not yielded in order.
+def turntable_views(positions, passes, temporal_samples=None):
+    scene = bpy.context.scene
+    get_camera().animation_data_clear()  # Camera locations are set directly for each rendered view
+    scene.frame_set(1)
+    if temporal_samples is None:
+        for frame, position in enumerate(positions, start=1):
+            view, camera_matrix = render_view_with_passes(position, passes)
+            yield frame, view, camera_matrix
+        return
+
+    frame_count = len(positions)
+    radius = config.temporal_radius
+    focal_length = scene_focal_length()
+    full_samples = scene.cycles.samples
+    scene.cycles.samples = temporal_samples
+    rendered = {}  # Frame -> (view, camera_matrix) of the raw low-sample renders still needed
+
+    # Frames near the start and end are needed again when the turntable wraps around
+    def keep(frame):
+        return frame <= 2 * radius or frame > frame_count - 2 * radius
+
+    def accumulate(frame):
+        view, camera_matrix = rendered[frame]
+        neighbours = []
+        for offset in range(-radius, radius + 1):
+            neighbour_frame = (frame - 1 + offset) % frame_count + 1
+            if offset != 0 and neighbour_frame != frame:
+                neighbour_view, neighbour_matrix = rendered[neighbour_frame]
+                neighbours.append((neighbour_view['Image'], neighbour_view['Depth'], neighbour_matrix))
+        accumulated = dict(view)
+        accumulated['Image'] = accumulate_temporal_frame(view['Image'], view['Depth'], camera_matrix, neighbours,
+                                                         focal_length, config.temporal_depth_tolerance)
+        return frame, accumulated, camera_matrix
+
+    try:
+        for frame, position in enumerate(positions, start=1):
+            rendered[frame] = render_view_with_passes(position, passes)
+            ready = frame - radius  # This frame now has all its following neighbours rendered
+            if radius < ready <= frame_count - radius:
+                yield accumulate(ready)
+                if ready - radius > 0 and not keep(ready - radius):
+                    del rendered[ready - radius]
+        # Finish the frames whose neighbours wrap around the start or end of the turntable
+        for frame in range(1, frame_count + 1):
+            if not radius < frame <= frame_count - radius:
+                yield accumulate(frame)
+    finally:
+        scene.cycles.samples = full_samples
+
+# Function to find the lowest sample count whose temporally accumulated frame stays within temporal_error_bound
+# of a full-sample reference render on the mesh (RGB of the foreground pixels, so the static background does not
+# dilute the error); positions are the camera locations of a representative turntable.
+# Returns None when no reduced sample count meets the bound, so the turntable is rendered normally instead.
+# The error is only measured on the first frame: views where reprojection is harder (e.g. strong reflections
+# or large disocclusions later in the turn) can exceed the bound, so lower temporal_error_bound for such meshes.
+def calibrate_temporal_samples(positions):
+    scene = bpy.context.scene
+    get_camera().animation_data_clear()
+    scene.frame_set(1)
+    full_samples = scene.cycles.samples
+    focal_length = scene_focal_length()
+    view = view_settings_tuple()
+    frame_count = len(positions)
+    window = set(offset % frame_count for offset in range(-config.temporal_radius, config.temporal_radius + 1))
+    reference, _ = render_view_with_passes(positions[0], ['Depth'])
+    reference_image = apply_view_transform(reference['Image'], *view)
+    foreground = foreground_mask(reference['Depth'])
+    samples = max(1, round(full_samples * config.temporal_sample_fraction))
+    try:
+        while samples < full_samples:
+            scene.cycles.samples = samples
+            views = {index: render_view_with_passes(positions[index], ['Depth']) for index in window}
+            centre_view, centre_matrix = views[0]
+            neighbours = [(views[index][0]['Image'], views[index][0]['Depth'], views[index][1]) for index in window if index != 0]
+            accumulated = accumulate_temporal_frame(centre_view['Image'], centre_view['Depth'], centre_matrix, neighbours,
+                                                    focal_length, config.temporal_depth_tolerance)
+            accumulated_image = apply_view_transform(accumulated, *view)
+            error = rmse(accumulated_image, reference_image, foreground)
+            print(f"Temporal accumulation at {samples} samples: RMSE {error:.4f} on the mesh, "
+                  f"{rmse(accumulated_image, reference_image):.4f} full frame (bound {config.temporal_error_bound})")
+            if error <= config.temporal_error_bound:
+                return samples
+            samples *= 2  # Too noisy, try again with twice the samples
+    finally:
+        scene.cycles.samples = full_samples
+    print("Temporal accumulation could not meet the error bound, rendering the turntables without it")
+    return None
+
+# Function to render a turntable at the given camera locations with temporal accumulation and encode it as a video
+def render_accumulated_turntable(positions, video_filepath, temporal_samples):
+    still_writer = get_still_writer()
+    view = view_settings_tuple()
+    frames_folder = os.path.splitext(video_filepath)[0] + "_frames"
+    os.makedirs(frames_folder, exist_ok=True)
+    frame_paths = {}
+    for frame, accumulated, _ in turntable_views(positions, ['Depth'], temporal_samples):
+        frame_paths[frame] = os.path.join(frames_folder, f"{frame:04d}.png")
+        still_writer.submit(accumulated['Image'], frame_paths[frame], view, temporary=True)
+    still_writer.flush()  # All frames must be on disk before encoding
+    encode_frames_to_video([frame_paths[frame] for frame in sorted(frame_paths)], video_filepath)
+    shutil.rmtree(frames_folder)
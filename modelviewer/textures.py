@@ -0,0 +1,103 @@
+#Texture stage run after import: downscale textures to the size they are seen at and share identical ones.
+
+# Import necessary modules
+import hashlib  # Standard Python module used to identify identical textures
+import os  # Standard Python module for interacting with the operating system
+from collections import OrderedDict  # Keeps the texture cache in least recently used order
+import bpy  # Blender Python API for scripting
+from . import config
+from .geometry import projected_size_in_pixels, texture_target_size
+from .meshes import world_bounding_box_size
+from .scene import scene_focal_length
+
+# (content hash, size, colour space) -> image datablock, least recently used first; bounded by
+# config.texture_cache_max_megabytes so long batches of unique textures do not keep growing the worker
+texture_cache = OrderedDict()
+
+# Function to hash the encoded bytes of an image (packed data for GLB textures, the file otherwise) without decoding it
+def image_content_hash(image):
+    if image.packed_file:
+        return hashlib.sha1(image.packed_file.data).hexdigest()
+    image_filepath = bpy.path.abspath(image.filepath)
+    if not os.path.isfile(image_filepath):
+        return None
+    with open(image_filepath, 'rb') as image_file:
+        return hashlib.sha1(image_file.read()).hexdigest()
+
+# Function to return an image datablock no larger than target_size, reusing the downscaled copy in texture_cache_path
+def load_downscaled_texture(image, content_hash, target_size):
+    # Keep high dynamic range textures in a float format, everything else is stored as PNG
+    extension = '.exr' if os.path.splitext(image.filepath)[1].lower() in ('.exr', '.hdr') else '.png'
+    cache_filepath = os.path.join(config.texture_cache_path, f"{content_hash}_{target_size}{extension}")
+    if not os.path.exists(cache_filepath):
+        width, height = image.size  # Decodes the original image
+        if max(width, height) <= target_size:
+            return image  # Already small enough, keep the imported image
+        scale = target_size / max(width, height)
+        image.scale(max(1, round(width * scale)), max(1, round(height * scale)))
+        image.file_format = 'OPEN_EXR' if extension == '.exr' else 'PNG'
+        temporary_filepath = f"{cache_filepath}.{os.getpid()}.tmp"  # Other workers may write the same texture
+        image.save(filepath=temporary_filepath)
+        os.replace(temporary_filepath, cache_filepath)
+    downscaled = bpy.data.images.load(cache_filepath)
+    downscaled.colorspace_settings.name = image.colorspace_settings.name  # Keep e.g. 'Non-Color' for normal maps
+    downscaled.alpha_mode = image.alpha_mode
+    return downscaled
+
+# Function to estimate the memory an image datablock holds once loaded (Blender keeps float images as 32-bit RGBA)
+def image_megabytes(image):
+    width, height = image.size
+    return width * height * 4 * (4 if image.is_float else 1) / 2 ** 20
+
+# Function to free the least recently used cached textures until the cache fits its memory budget,
+# keeping the textures in keep (those of the current mesh)
+def evict_textures(keep):
+    total = sum(image_megabytes(image) for image in texture_cache.values())
+    for cache_key in list(texture_cache):
+        if total <= config.texture_cache_max_megabytes:
+            break
+        image = texture_cache[cache_key]
+        if image in keep:
+            continue
+        total -= image_megabytes(image)
+        del texture_cache[cache_key]
+        image.use_fake_user = False
+        bpy.data.images.remove(image)
+
+# Function to swap the mesh's textures for downscaled copies sized to its screen coverage, sharing one datablock
+# per identical texture while it stays in the cache
+def optimize_mesh_textures(mesh_object, distance):
+    os.makedirs(config.texture_cache_path, exist_ok=True)
+    target_size = texture_target_size(projected_size_in_pixels(world_bounding_box_size(mesh_object), distance, scene_focal_length()),
+                                      config.texture_detail_factor)
+    images = set()
+    for material in mesh_object.data.materials:
+        if material and material.use_nodes:
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image and node.image.source == 'FILE':
+                    images.add(node.image)
+    used = set()
+    for image in images:
+        if image.use_fake_user:
+            used.add(image)  # Already one of the cached textures
+            continue
+        content_hash = image_content_hash(image)
+        if content_hash is None:
+            continue  # Missing file, leave the image as imported
+        # The same file can be used as colour (sRGB) and as data (Non-Color), which must not share a datablock
+        cache_key = (content_hash, target_size, image.colorspace_settings.name)
+        cached = texture_cache.get(cache_key)
+        if cached is None:
+            cached = load_downscaled_texture(image, content_hash, target_size)
+            cached.use_fake_user = True  # Keep the datablock alive after the mesh is deleted
+            texture_cache[cache_key] = cached
+        texture_cache.move_to_end(cache_key)  # Most recently used
+        used.add(cached)
+        if cached != image:
+            image.user_remap(cached)  # Point every material at the cached texture
+            bpy.data.images.remove(image)
+    for cache_key, cached in list(texture_cache.items()):
+        if cached in used:
+            texture_cache.move_to_end(cache_key)
+    evict_textures(used)
+    print(f"Textures of {mesh_object.name} limited to {target_size}px, {len(texture_cache)} textures cached")
@@ -0,0 +1,51 @@
+#Stereoscopic turntable animations rendered as Blender animations (or frame by frame with temporal accumulation).
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import bpy  # Blender Python API for scripting
+from .geometry import turntable_camera_positions
+from .rendering import apply_video_settings
+from .scene import get_camera
+from .temporal import render_accumulated_turntable
+
+# Function to rotate the camera around the mesh for a turntable animation
+def rotate_camera_around_mesh(camera, mesh_object, frame_count, radius, eye_offset=0):
+    positions = turntable_camera_positions(mesh_object.location, frame_count, radius, eye_offset)
+    for frame, position in enumerate(positions, start=1):  # Iterate through each frame
+        camera.location = position  # Move the camera to this frame's position
+        camera.keyframe_insert(data_path="location", frame=frame)  # Insert a keyframe for the camera's location
+        bpy.context.view_layer.update()  # Update the view layer
+        print(f"Frame {frame}: Camera location - {camera.location}")  # Print the camera's location for debugging
+
+# Function to render a stereoscopic turntable animation with left and right eye views
+# temporal_samples enables temporal accumulation at that sample count
+def render_stereoscopic_turntable(subfolder_name, mesh_object, output_path, frame_count, radius, eye_distance, temporal_samples=None):
+    camera = get_camera()
+    mesh_name = mesh_object.name
+    bpy.context.scene.frame_start = 1  # Set the start frame
+    bpy.context.scene.frame_end = frame_count  # Set the end frame
+    
+    # Set common render settings
+    apply_video_settings(bpy.context.scene)
+
+    # Render for the left eye
+    print("Rendering for left eye")
+    left_eye_video = os.path.join(output_path, f"{subfolder_name}{mesh_name}_turntable_left{eye_distance}mm.mp4")  # Define the output path for the left eye video
+    if temporal_samples is not None:
+        render_accumulated_turntable(turntable_camera_positions(mesh_object.location, frame_count, radius, -eye_distance / 2), left_eye_video, temporal_samples)
+    else:
+        rotate_camera_around_mesh(camera, mesh_object, frame_count, radius, -eye_distance / 2)  # Rotate the camera for the left eye
+        bpy.context.scene.render.filepath = left_eye_video  # Set the file path for the left eye render
+        bpy.ops.render.render(animation=True)  # Render the left eye animation
+    print(f"Rendered 360-degree turntable for left eye of {mesh_name}")
+
+    # Render for the right eye
+    print("Rendering for right eye")
+    right_eye_video = os.path.join(output_path, f"{subfolder_name}{mesh_name}_turntable_right{eye_distance}mm.mp4")  # Define the output path for the right eye video
+    if temporal_samples is not None:
+        render_accumulated_turntable(turntable_camera_positions(mesh_object.location, frame_count, radius, eye_distance / 2), right_eye_video, temporal_samples)
+    else:
+        rotate_camera_around_mesh(camera, mesh_object, frame_count, radius, eye_distance / 2)  # Rotate the camera for the right eye
+        bpy.context.scene.render.filepath = right_eye_video  # Set the file path for the right eye render
+        bpy.ops.render.render(animation=True)  # Render the right eye animation
+    print(f"Rendered 360-degree turntable for right eye of {mesh_name}")
@@ -0,0 +1,117 @@
+#Background writer pool for rendered images. Uses threads and NumPy only (no bpy), so encoding and writing run
+#while Blender renders the next view.
+
+# Import necessary modules
+import os  # Standard Python module for interacting with the operating system
+import threading  # Standard Python module for thread synchronisation
+from concurrent.futures import ThreadPoolExecutor  # Thread pool used to write still images in the background
+import numpy as np  # NumPy ships with Blender and is used to handle rendered pixel buffers
+from .imaging import apply_view_transform, assemble_contact_sheet, downscale_pixels, encode_png
+
+# Pillow is optional: with it WebP/JPEG derivatives of the still images are encoded in the writer threads,
+# without it rendering.save_render_derivatives writes them with Blender's own image writers
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+# File extensions of the derivative formats
+derivative_extensions = {'WEBP': '.webp', 'JPEG': '.jpg'}
+
+# Pool of background threads that encode and write still images while the next view renders
+class StillWriterPool:
+    def __init__(self, threads, max_pending, bit_depth=8, compression=15, derivative_formats=(),
+                 derivative_quality=90, thumb_width=320):
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.slots = threading.BoundedSemaphore(max_pending)  # Limits how many pixel buffers are held in memory
+        self.bit_depth = bit_depth
+        self.compression = compression
+        self.derivative_formats = list(derivative_formats)
+        self.derivative_quality = derivative_quality
+        self.thumb_width = thumb_width
+        self.futures = []  # Writes that have been queued but not yet checked for errors
+        self.contact_sheets = {}  # Contact sheet path -> list of thumbnails in submission order
+        if self.derivative_formats and PILImage is None:
+            print("Pillow is not available; WebP/JPEG derivatives will be written by Blender on the main thread.")
+            self.derivative_formats = []  # Left to the caller, see rendering.save_render_derivatives
+
+    # Queue a rendered image for writing; blocks while max_pending images are already waiting (back-pressure)
+    # pixels is an array, or a function returning one (e.g. grab_render_pixels) that is only called once a slot
+    # is free, so no more than max_pending buffers are held. view is the (view_transform, exposure, gamma) tuple
+    # applied in the writer thread. temporary images (frames that are encoded into a video and deleted) are
+    # written as 8-bit PNGs without derivatives.
+    def submit(self, pixels, filepath, view, contact_sheet_path=None, temporary=False):
+        self.check_errors()
+        thumbnail_slot = None
+        if contact_sheet_path is not None:
+            thumbnails = self.contact_sheets.setdefault(contact_sheet_path, [])
+            thumbnails.append(None)  # Reserve the slot now so the sheet keeps the render order
+            thumbnail_slot = (thumbnails, len(thumbnails) - 1)
+        self.slots.acquire()
+        try:
+            if callable(pixels):
+                pixels = pixels()
+            bit_depth, derivative_formats = (8, []) if temporary else (self.bit_depth, self.derivative_formats)
+            future = self.executor.submit(self._write_still, pixels, filepath, view, thumbnail_slot, bit_depth, derivative_formats)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append(future)
+
+    # Queue the contact sheet for all stills submitted under contact_sheet_path
+    def finish_contact_sheet(self, contact_sheet_path):
+        thumbnails = self.contact_sheets.pop(contact_sheet_path, None)
+        if not thumbnails:
+            return
+        # The executor runs tasks in submission order, so every thumbnail write has started before this task
+        pending = [future for future in self.futures if not future.done()]
+        self.futures.append(self.executor.submit(self._write_contact_sheet, thumbnails, contact_sheet_path, pending))
+
+    # Raise the first error from any finished write so failures are not silently lost
+    def check_errors(self):
+        still_pending = []
+        for future in self.futures:
+            if future.done():
+                future.result()
+            else:
+                still_pending.append(future)
+        self.futures = still_pending
+
+    # Wait for every queued write to finish, keeping the threads running
+    def flush(self):
+        for future in self.futures:
+            future.result()
+        self.futures = []
+
+    # Wait for every queued write to finish and stop the threads
+    def close(self):
+        for future in self.futures:
+            future.result()
+        self.futures = []
+        self.executor.shutdown(wait=True)
+
+    def _write_still(self, pixels, filepath, view, thumbnail_slot, bit_depth, derivative_formats):
+        pixels = apply_view_transform(pixels, *view)
+        if pixels.shape[-1] == 4 and np.all(pixels[..., 3] >= 1.0):
+            pixels = pixels[..., :3]  # Drop the alpha channel when the image is fully opaque
+        with open(filepath, 'wb') as still_file:
+            still_file.write(encode_png(pixels, bit_depth, self.compression))
+        if derivative_formats:
+            rgb8 = np.round(pixels[..., :3] * 255).astype(np.uint8)
+            for derivative_format in derivative_formats:
+                extension = derivative_extensions[derivative_format]
+                PILImage.fromarray(rgb8).save(os.path.splitext(filepath)[0] + extension, derivative_format,
+                                              quality=self.derivative_quality)
+        if thumbnail_slot is not None:
+            thumbnails, index = thumbnail_slot
+            thumbnails[index] = downscale_pixels(pixels, self.thumb_width)
+        print(f"Wrote {filepath}")
+
+    def _write_contact_sheet(self, thumbnails, contact_sheet_path, pending):
+        for future in pending:
+            future.result()
+        thumbnails = [thumbnail for thumbnail in thumbnails if thumbnail is not None]
+        with open(contact_sheet_path, 'wb') as sheet_file:
+            sheet_file.write(encode_png(assemble_contact_sheet(thumbnails), 8, self.compression))
+        print(f"Wrote contact sheet {contact_sheet_path}")